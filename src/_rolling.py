@@ -0,0 +1,94 @@
+"""
+Numba-compiled sliding-window kernels used by feature engineering.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _sliding_mean_std_into(
+    values: np.ndarray,
+    window: int,
+    min_periods: int,
+    means: np.ndarray,
+    stds: np.ndarray,
+) -> None:
+    """
+    Write the rolling mean and std of `values` into `means` / `stds`.
+
+    Uses the moving-window form of Welford's update (as in numbagg's
+    `move_std`): the running mean and sum of squared deviations are
+    updated as one value enters and one leaves the window. The state is
+    float64 regardless of the input dtype.
+    """
+    n = values.shape[0]
+
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+
+    for i in range(n):
+        x = np.float64(values[i])
+        if i >= window:
+            # Replace the value leaving the window with the incoming one
+            old = np.float64(values[i - window])
+            delta = x - old
+            prev_mean = mean
+            mean += delta / count
+            m2 += delta * (x - mean + old - prev_mean)
+        else:
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+
+        if count < min_periods:
+            means[i] = np.nan
+            stds[i] = np.nan
+            continue
+
+        means[i] = mean
+        if count > 1:
+            stds[i] = np.sqrt(max(m2 / (count - 1), 0.0))
+        else:
+            stds[i] = np.nan
+
+
+@njit(cache=True, parallel=True)
+def sliding_mean_std_2d_into(
+    X: np.ndarray,
+    window: int,
+    min_periods: int,
+    means: np.ndarray,
+    stds: np.ndarray,
+) -> None:
+    """
+    Rolling mean and sample standard deviation (ddof=1) of each column of a
+    2D `(n_samples, n_channels)` array, written into preallocated `means` /
+    `stds` of the same shape, with channels processed in parallel.
+
+    Equivalent to pandas `rolling(window, min_periods=min_periods).mean()`
+    and `.std()` per column for NaN-free input: positions with fewer than
+    `min_periods` observations are NaN.
+
+    Pass column-major (Fortran-ordered) arrays so each channel is a
+    contiguous strip of memory.
+    """
+    for c in prange(X.shape[1]):
+        _sliding_mean_std_into(X[:, c], window, min_periods, means[:, c], stds[:, c])
+
+
+def _warmup() -> None:
+    """
+    Trigger compilation (or loading from the on-disk cache) on a tiny input,
+    so the JIT cost is paid at import rather than on the first real call.
+    """
+    X = np.zeros((4, 2), dtype=np.float32, order="F")
+    out = np.empty((4, 4), dtype=np.float32, order="F")
+    sliding_mean_std_2d_into(X, 2, 2, out[:, :2], out[:, 2:])
+
+
+_warmup()
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+
+
+# Default generator for callers that do not pass their own; PCG64 is both
+# faster than the legacy Mersenne Twister and draws into a single buffer.
+_rng = np.random.default_rng()
 
 
 def generate_time_series(run_duration: int = 300, fs: float = 1.0) -> np.ndarray:
@@ -15,7 +22,85 @@ def generate_time_series(run_duration: int = 300, fs: float = 1.0) -> np.ndarray
     return t
 
 
-def normal_behavior(t: np.ndarray) -> pd.DataFrame:
+# Noise standard deviations for Pc, N_pump, T_in, Vib, fuel_flow,
+# bearing_temp and thrust, in that order.
+NOISE_SCALES = np.array([0.5, 20.0, 1.0, 0.05, 0.5, 0.5, 1.0])
+
+
+def _nominal_templates(t: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Deterministic (noise-free) part of the nominal channels.
+
+    These only depend on the time axis, so they are computed once per `t`
+    and shared by every run; each run only draws fresh noise on top.
+    Thrust is not included because it is derived from the noisy Pc and
+    fuel flow.
+    """
+    # All six tanh ramps (center, width) evaluated in one vectorized pass
+    ramps = np.array(
+        [
+            [30.0, 10.0],  # Pc ramp up
+            [270.0, 10.0],  # Pc ramp down
+            [30.0, 15.0],  # N_pump spin up
+            [270.0, 15.0],  # N_pump spin down
+            [40.0, 20.0],  # fuel flow main phase
+            [60.0, 40.0],  # bearing temperature drift
+        ]
+    )
+    th = np.subtract(t, ramps[:, :1])
+    th /= ramps[:, 1:]
+    np.tanh(th, out=th)
+
+    # Chamber pressure: ramp up, steady, ramp down
+    Pc = 50 + 30 * (th[0] - th[1])
+
+    # Turbopump speed
+    N_pump = 3000 + 1500 * (th[2] - th[3])
+
+    # Inlet temperature with slow oscillation
+    T_in = 300 + 20 * np.sin(t / 50)
+
+    # Base vibrations
+    Vib = np.full_like(t, 0.3, dtype=np.float64)
+
+    # Fuel flow (kg/s), slightly higher during main phase
+    fuel_flow = 100 + 5 * th[4]
+
+    # Bearing temperature, slow drift upwards
+    bearing_temp = 80 + 5 * th[5]
+
+    return {
+        "Pc": Pc,
+        "N_pump": N_pump,
+        "T_in": T_in,
+        "Vib": Vib,
+        "fuel_flow": fuel_flow,
+        "bearing_temp": bearing_temp,
+    }
+
+
+@lru_cache(maxsize=8)
+def _templates(
+    run_duration: int, fs: float
+) -> Tuple[np.ndarray, Dict[str, np.ndarray], Dict[str, Dict[str, np.ndarray]]]:
+    """
+    Time axis, nominal templates and fault delta table for a given run
+    length and sampling rate, built once and shared by every run. The
+    arrays are read-only, since every caller of this cache sees the same
+    objects.
+    """
+    t = generate_time_series(run_duration=run_duration, fs=fs)
+    templates = _nominal_templates(t)
+    for arr in (t, *templates.values()):
+        arr.setflags(write=False)
+    return t, templates, _fault_delta_table(t)
+
+
+def normal_behavior(
+    t: np.ndarray,
+    templates: Optional[Dict[str, np.ndarray]] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> pd.DataFrame:
     """
     Nominal operation of a liquid-propellant rocket engine.
 
@@ -27,123 +112,259 @@ def normal_behavior(t: np.ndarray) -> pd.DataFrame:
     - fuel_flow:   fuel mass flow
     - bearing_temp: bearing temperature
     - thrust:      simplified thrust proxy
+
+    `templates` may be passed in (see `_nominal_templates`) to reuse the
+    deterministic part across many runs on the same time axis, and `rng`
+    to make the noise reproducible.
     """
-    n = len(t)
+    if templates is None:
+        templates = _nominal_templates(t)
+    if rng is None:
+        rng = _rng
 
-    # Chamber pressure: ramp up, steady, ramp down
-    Pc = 50 + 30 * (np.tanh((t - 30) / 10)) - 30 * (np.tanh((t - 270) / 10))
-    Pc += np.random.normal(0, 0.5, size=n)
+    return _to_frame(t, _nominal_channels(t, templates, rng), "normal")
 
-    # Turbopump speed
-    N_pump = 3000 + 1500 * (np.tanh((t - 30) / 15)) - 1500 * (np.tanh((t - 270) / 15))
-    N_pump += np.random.normal(0, 20, size=n)
 
-    # Inlet temperature with slow oscillation
-    T_in = 300 + 20 * np.sin(t / 50) + np.random.normal(0, 1, size=n)
+def _nominal_channels(
+    t: np.ndarray,
+    templates: Dict[str, np.ndarray],
+    rng: np.random.Generator,
+) -> Dict[str, np.ndarray]:
+    """
+    Noisy nominal channels as NumPy arrays. Each channel is a row of one
+    freshly drawn noise buffer, with its template added in place.
+    """
+    # One draw for all channels, scaled in place to each channel's sigma
+    noise = rng.standard_normal((7, len(t)))
+    noise *= NOISE_SCALES[:, None]
 
-    # Base vibrations
-    Vib = 0.3 + 0.05 * np.random.normal(0, 1, size=n)
+    channels = {
+        name: np.add(noise[row], templates[name], out=noise[row])
+        for row, name in enumerate(
+            ["Pc", "N_pump", "T_in", "Vib", "fuel_flow", "bearing_temp"]
+        )
+    }
 
-    # Fuel flow (kg/s), slightly higher during main phase
-    fuel_flow = 100 + 5 * np.tanh((t - 40) / 20)
-    fuel_flow += np.random.normal(0, 0.5, size=n)
+    # Simplified thrust proxy: mix of pressure and fuel flow
+    thrust = noise[6]
+    thrust += 0.8 * channels["Pc"]
+    thrust += 0.2 * channels["fuel_flow"]
+    channels["thrust"] = thrust
 
-    # Bearing temperature, slow drift upwards
-    bearing_temp = 80 + 5 * np.tanh((t - 60) / 40)
-    bearing_temp += np.random.normal(0, 0.5, size=n)
+    return channels
+
+
+def _to_frame(
+    t: np.ndarray, channels: Dict[str, np.ndarray], label: str
+) -> pd.DataFrame:
+    """
+    Assemble a run DataFrame from the time axis and channel arrays.
+    """
+    return pd.DataFrame({"time": t, **channels, "label": label})
+
+
+def _pressure_decay(t: np.ndarray) -> Dict[str, np.ndarray]:
+    # Slow chamber pressure decay over the run
+    decay = -0.1 * (t / t.max())
+    return {"Pc": decay * 30}
+
+
+def _turbopump_overspeed(t: np.ndarray) -> Dict[str, np.ndarray]:
+    # Turbopump overspeed in the second half of the run
+    mask = t > 150
+    overspeed = np.zeros_like(t, dtype=np.float64)
+    overspeed[mask] = 2000 * np.tanh((t[mask] - 150) / 10)
+    return {"N_pump": overspeed}
+
+
+def _temp_rise(t: np.ndarray) -> Dict[str, np.ndarray]:
+    # Strong injector temperature rise later in the run
+    return {"T_in": 100 * (np.tanh((t - 200) / 10))}
+
+
+def _vibration_increase(t: np.ndarray) -> Dict[str, np.ndarray]:
+    # Global vibration increase (e.g. imbalance, cavitation)
+    return {"Vib": 1.5 * (np.tanh((t - 180) / 10))}
 
-    # Simplified thrust proxy: mix of pressure and fuel flow
-    thrust = 0.8 * Pc + 0.2 * fuel_flow
-    thrust += np.random.normal(0, 1.0, size=n)
-
-    return pd.DataFrame(
-        {
-            "time": t,
-            "Pc": Pc,
-            "N_pump": N_pump,
-            "T_in": T_in,
-            "Vib": Vib,
-            "fuel_flow": fuel_flow,
-            "bearing_temp": bearing_temp,
-            "thrust": thrust,
-            "label": "normal",
-        }
-    )
 
+def _fuel_leak(t: np.ndarray) -> Dict[str, np.ndarray]:
+    # Fuel flow increase while Pc and thrust degrade
+    leak = 10 * (np.tanh((t - 160) / 15))
+    return {"fuel_flow": leak, "Pc": -0.4 * leak, "thrust": -0.6 * leak}
 
-def faulty_behavior(t: np.ndarray, fault_type: str) -> pd.DataFrame:
+
+def _bearing_overheat(t: np.ndarray) -> Dict[str, np.ndarray]:
+    # Bearing overheating and increased vibration
+    over = np.tanh((t - 170) / 10)
+    return {"bearing_temp": 40 * over, "Vib": 0.5 * over}
+
+
+# Builders of the deterministic per-channel deltas each fault adds on top
+# of nominal behavior.
+_FAULT_DELTA_BUILDERS: Dict[str, Callable[[np.ndarray], Dict[str, np.ndarray]]] = {
+    "pressure_decay": _pressure_decay,
+    "turbopump_overspeed": _turbopump_overspeed,
+    "temp_rise": _temp_rise,
+    "vibration_increase": _vibration_increase,
+    "fuel_leak": _fuel_leak,
+    "bearing_overheat": _bearing_overheat,
+}
+
+# Extra per-run noise some faults add: fault -> (channel, sigma)
+_FAULT_EXTRA_NOISE: Dict[str, Tuple[str, float]] = {
+    # Broadband vibration noise on top of the deterministic rise
+    "vibration_increase": ("Vib", 0.1),
+}
+
+FAULTS: List[str] = list(_FAULT_DELTA_BUILDERS)
+
+def _fault_delta_table(t: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Table fault_type -> channel -> deterministic delta for a time axis.
+
+    Meant to be built once per batch and passed to `faulty_behavior`, so
+    fault runs only add noise and these read-only deltas.
+    """
+    table = {fault: build(t) for fault, build in _FAULT_DELTA_BUILDERS.items()}
+    for deltas in table.values():
+        for arr in deltas.values():
+            arr.setflags(write=False)
+    return table
+
+
+def faulty_behavior(
+    t: np.ndarray,
+    fault_type: str,
+    templates: Optional[Dict[str, np.ndarray]] = None,
+    rng: Optional[np.random.Generator] = None,
+    fault_deltas: Optional[Dict[str, Dict[str, np.ndarray]]] = None,
+) -> pd.DataFrame:
     """
     Start from normal behavior and inject specific fault patterns.
+
+    `fault_deltas` may be passed in (see `_fault_delta_table`) to reuse the
+    deterministic fault patterns across many runs on the same time axis;
+    otherwise only the requested fault's deltas are computed.
     """
-    df = normal_behavior(t)
+    if fault_type not in _FAULT_DELTA_BUILDERS:
+        raise ValueError(f"Unknown fault type {fault_type!r}; expected one of {FAULTS}")
+    if fault_deltas is None:
+        deltas = _FAULT_DELTA_BUILDERS[fault_type](t)
+    else:
+        deltas = fault_deltas[fault_type]
+    if templates is None:
+        templates = _nominal_templates(t)
+    if rng is None:
+        rng = _rng
+
+    channels = _nominal_channels(t, templates, rng)
+
+    for channel, delta in deltas.items():
+        channels[channel] += delta
+
+    extra = _FAULT_EXTRA_NOISE.get(fault_type)
+    if extra is not None:
+        channel, sigma = extra
+        noise = rng.standard_normal(len(t))
+        noise *= sigma
+        channels[channel] += noise
+
+    return _to_frame(t, channels, fault_type)
+
+
+def _run_specs(
+    seed: Optional[int],
+) -> List[Tuple[str, Optional[str], np.random.SeedSequence]]:
+    """
+    The standard batch of runs as (name, fault_type, seed) specs: several
+    normal runs, then two runs per fault regime. Each run gets its own
+    child of `SeedSequence(seed)`.
+    """
+    runs: List[Tuple[str, Optional[str]]] = [
+        (f"normal_run_{i}", None) for i in range(3)
+    ]
+    runs += [(f"{fault}_run_{i}", fault) for fault in FAULTS for i in range(2)]
 
-    if fault_type == "pressure_decay":
-        # Slow chamber pressure decay over the run
-        decay = -0.1 * (t / t.max())
-        df["Pc"] += decay * 30
+    seeds = np.random.SeedSequence(seed).spawn(len(runs))
+    return [(name, fault, seed_seq) for (name, fault), seed_seq in zip(runs, seeds)]
 
-    elif fault_type == "turbopump_overspeed":
-        # Turbopump overspeed in the second half of the run
-        overspeed = df["N_pump"] + 2000 * (np.tanh((t - 150) / 10))
-        df["N_pump"] = np.where(t > 150, overspeed, df["N_pump"])
 
-    elif fault_type == "temp_rise":
-        # Strong injector temperature rise later in the run
-        rise = 100 * (np.tanh((t - 200) / 10))
-        df["T_in"] += rise
+def _make_run(
+    run_duration: int,
+    fs: float,
+    spec: Tuple[str, Optional[str], np.random.SeedSequence],
+) -> pd.DataFrame:
+    """
+    Generate the run described by `spec` = (name, fault_type, seed). A
+    `fault_type` of None means a normal run.
 
-    elif fault_type == "vibration_increase":
-        # Global vibration increase (e.g. imbalance, cavitation)
-        increase = 1.5 * (np.tanh((t - 180) / 10))
-        df["Vib"] += increase + 0.1 * np.random.normal(0, 1, size=len(t))
+    Templates and fault deltas come from the per-process `_templates`
+    cache, so each process builds them once rather than once per run.
+    """
+    _, fault_type, seed_seq = spec
+    t, templates, fault_deltas = _templates(run_duration, fs)
+    rng = np.random.default_rng(seed_seq)
+    if fault_type is None:
+        return normal_behavior(t, templates, rng)
+    return faulty_behavior(t, fault_type, templates, rng, fault_deltas)
 
-    elif fault_type == "fuel_leak":
-        # Fuel flow increase while Pc and thrust degrade
-        leak = 10 * (np.tanh((t - 160) / 15))
-        df["fuel_flow"] += leak
-        df["Pc"] -= 0.4 * leak
-        df["thrust"] -= 0.6 * leak
 
-    elif fault_type == "bearing_overheat":
-        # Bearing overheating and increased vibration
-        over = 40 * (np.tanh((t - 170) / 10))
-        df["bearing_temp"] += over
-        df["Vib"] += 0.5 * (np.tanh((t - 170) / 10))
+def generate_runs(
+    fs: float = 1.0,
+    run_duration: int = 300,
+    seed: Optional[int] = None,
+) -> List[pd.DataFrame]:
+    """
+    Generate the same batch of runs as `generate_and_save_runs` (with the
+    same per-run seeds), but keep them in memory instead of writing files.
+    """
+    return [_make_run(run_duration, fs, spec) for spec in _run_specs(seed)]
 
-    df["label"] = fault_type
-    return df
+
+def _make_and_save(
+    run_duration: int,
+    fs: float,
+    spec: Tuple[str, Optional[str], np.random.SeedSequence],
+    out_path: Path,
+) -> None:
+    """
+    Generate one run described by `spec` and write it to `out_path` as
+    zstd-compressed Parquet, with float32 channels.
+    """
+    name = spec[0]
+    df = _make_run(run_duration, fs, spec)
+    channels = [col for col in df.columns if col not in ("time", "label")]
+    df = df.astype({col: np.float32 for col in channels})
+    df.to_parquet(
+        out_path / f"{name}.parquet",
+        engine="pyarrow",
+        compression="zstd",
+        index=False,
+    )
 
 
 def generate_and_save_runs(
     out_dir: str = "data",
     fs: float = 1.0,
     run_duration: int = 300,
+    seed: Optional[int] = None,
+    n_jobs: int = -1,
 ) -> None:
     """
-    Generate several normal and faulty runs and save as CSV files in `out_dir`.
+    Generate several normal and faulty runs and save as Parquet files in `out_dir`.
+    Pass `seed` for a reproducible set of runs.
+
+    Runs are independent, so they are generated and written in parallel
+    worker processes (`n_jobs` as in joblib). Each run has its own seed
+    (see `_run_specs`), so the output does not depend on scheduling.
     """
     out_path = Path(out_dir)
     out_path.mkdir(exist_ok=True)
 
-    t = generate_time_series(run_duration=run_duration, fs=fs)
-
-    # Several normal runs
-    for i in range(3):
-        df = normal_behavior(t)
-        df.to_csv(out_path / f"normal_run_{i}.csv", index=False)
-
-    faults = [
-        "pressure_decay",
-        "turbopump_overspeed",
-        "temp_rise",
-        "vibration_increase",
-        "fuel_leak",
-        "bearing_overheat",
-    ]
-    for fault in faults:
-        for i in range(2):
-            df = faulty_behavior(t, fault)
-            df.to_csv(out_path / f"{fault}_run_{i}.csv", index=False)
+    Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(_make_and_save)(run_duration, fs, spec, out_path)
+        for spec in _run_specs(seed)
+    )
 
     print(f"Saved synthetic runs to {out_path.resolve()}")
 
@@ -0,0 +1,33 @@
+"""
+End-to-end pipeline in a single process: generate telemetry, build
+features, train the classifier and save the health index.
+
+Unlike running src/generate_telemetry.py and src/train_health_index.py in
+turn, the runs stay in memory, so the Parquet write + read round trip is
+skipped entirely. The file-based scripts remain for persisting runs.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import pandas as pd
+
+from .generate_telemetry import generate_runs
+from .preprocessing import feature_engineering
+from .train_health_index import save_health_index, train_health_index
+
+
+def main(seed: Optional[int] = None, window: int = 10) -> None:
+    runs = generate_runs(seed=seed)
+    print(f"Generated {len(runs)} telemetry runs in memory")
+    df_raw = pd.concat(runs, ignore_index=True)
+
+    df_feat = feature_engineering(df_raw, window=window)
+
+    health_df = train_health_index(df_feat)
+    save_health_index(health_df)
+
+
+if __name__ == "__main__":
+    main()
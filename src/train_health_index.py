@@ -3,8 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 
@@ -12,6 +13,24 @@ from .preprocessing import feature_engineering, load_data
 from .visualization import plot_health_index
 
 
+def _normal_probability(
+    clf: HistGradientBoostingClassifier, X: np.ndarray, normal_idx: int
+) -> np.ndarray:
+    """
+    P(class == "normal") for the binary normal-vs-fault classifier,
+    computed from the model's raw logits in float32 without materializing
+    the (n, 2) predict_proba matrix.
+    """
+    # raw is the logit of classes_[1], so P(normal) is a sigmoid of +raw or
+    # -raw. Evaluated as 1 / (1 + exp(-logit)) in place.
+    raw = clf.decision_function(X).astype(np.float32, copy=False)
+    if normal_idx == 1:
+        np.negative(raw, out=raw)
+    np.exp(raw, out=raw)
+    raw += 1
+    return np.reciprocal(raw, out=raw)
+
+
 def main() -> None:
     data_dir = Path("data")
     if not data_dir.exists():
@@ -19,48 +38,65 @@ def main() -> None:
             "data/ directory not found. Run src/generate_telemetry.py first."
         )
 
-    # Collect all CSV files with runs
-    csv_files: List[str] = [str(p) for p in data_dir.glob("*.csv")]
-    if not csv_files:
+    # Collect all Parquet files with runs
+    run_files: List[str] = [str(p) for p in data_dir.glob("*.parquet")]
+    if not run_files:
         raise FileNotFoundError(
-            "No CSV files found in data/. Run src/generate_telemetry.py first."
+            "No Parquet files found in data/. Run src/generate_telemetry.py first."
         )
 
-    print(f"Loading {len(csv_files)} telemetry files...")
-    df_raw = load_data(csv_files)
+    print(f"Loading {len(run_files)} telemetry files...")
+    df_raw = load_data(run_files)
 
     # Feature engineering
     df_feat = feature_engineering(df_raw, window=10)
 
+    health_df = train_health_index(df_feat)
+    save_health_index(health_df)
+
+
+def train_health_index(df_feat: pd.DataFrame) -> pd.DataFrame:
+    """
+    Train the normal-vs-fault classifier on engineered features, print a
+    validation report and return the health index for every row.
+    Returns a frame with columns: 'time', 'health_index', 'label'.
+    """
     # Prepare features and labels
     feature_cols = [c for c in df_feat.columns if c not in ("label", "time")]
-    X = df_feat[feature_cols]
-    y = df_feat["label"]
+    # The model only needs float32 features, so avoid carrying (and having
+    # sklearn copy) a float64 frame.
+    X = np.ascontiguousarray(df_feat[feature_cols].to_numpy(dtype=np.float32))
+    # Only P(normal) is used downstream, so all fault regimes are merged
+    # into a single "fault" class and the model is a binary classifier.
+    y = np.where(df_feat["label"].to_numpy() == "normal", "normal", "fault")
 
     X_train, X_val, y_train, y_val = train_test_split(
         X, y, stratify=y, test_size=0.2, random_state=42
     )
 
-    clf = RandomForestClassifier(
-        n_estimators=200,
-        max_depth=None,
+    # Histogram-binned gradient boosting: features are quantized to at most
+    # 255 bins and trees are grown with OpenMP, which is much faster than a
+    # random forest at this scale.
+    clf = HistGradientBoostingClassifier(
+        max_iter=200,
+        max_bins=255,
+        early_stopping=True,
         random_state=42,
     )
     clf.fit(X_train, y_train)
 
     y_pred = clf.predict(X_val)
-    print("Classification report (fault vs normal regimes):")
+    print("Classification report (fault vs normal):")
     print(classification_report(y_val, y_pred))
 
     # Compute health index on the full feature set
-    proba = clf.predict_proba(X)
     classes = list(clf.classes_)
     if "normal" not in classes:
         raise ValueError(
             f"'normal' class not found in classifier classes: {classes}"
         )
     normal_idx = classes.index("normal")
-    health = proba[:, normal_idx]
+    health = _normal_probability(clf, X, normal_idx)
 
     health_df = pd.DataFrame(
         {
@@ -70,7 +106,15 @@ def main() -> None:
         }
     )
 
+    return health_df
+
+
+def save_health_index(health_df: pd.DataFrame) -> None:
+    """
+    Save the health index time series to data/ and plot it.
+    """
     out_path = Path("data") / "health_index.csv"
+    out_path.parent.mkdir(exist_ok=True)
     health_df.to_csv(out_path, index=False)
     print(f"Saved health index time series to {out_path.resolve()}")
 
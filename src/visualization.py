@@ -3,8 +3,15 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Optional
 
+import matplotlib
+
+# Non-interactive backend: figures are only ever saved to disk.
+matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.collections import LineCollection
 
 
 FIGURES_DIR = Path("figures")
@@ -20,13 +27,23 @@ def plot_time_series_with_labels(
     """
     Plot a single telemetry channel over time, color-coded by label.
     Assumes df has columns: 'time', channel, 'label'.
+
+    Each label is drawn as one LineCollection, with a separate segment per
+    run (a run boundary is where time goes backwards).
     """
     fig, ax = plt.subplots(figsize=(10, 4))
 
-    labels = df["label"].unique()
-    for lbl in labels:
-        mask = df["label"] == lbl
-        ax.plot(df.loc[mask, "time"], df.loc[mask, channel], label=str(lbl))
+    # One grouping pass instead of a boolean mask scan per label
+    for i, (lbl, sub) in enumerate(df.groupby("label", sort=False)):
+        time = sub["time"].to_numpy()
+        values = sub[channel].to_numpy()
+        starts = np.flatnonzero(np.diff(time) < 0) + 1
+        segments = [
+            np.column_stack(seg)
+            for seg in zip(np.split(time, starts), np.split(values, starts))
+        ]
+        ax.add_collection(LineCollection(segments, colors=f"C{i}", label=str(lbl)))
+    ax.autoscale_view()
 
     ax.set_xlabel("Time, s")
     ax.set_ylabel(channel)
@@ -51,7 +68,13 @@ def plot_health_index(
     """
     fig, ax = plt.subplots(figsize=(10, 4))
 
-    ax.plot(df["time"], df["health_index"], label="Health index (P(normal))")
+    ax.plot(
+        df["time"].to_numpy(),
+        df["health_index"].to_numpy(),
+        linewidth=0.8,
+        antialiased=False,
+        label="Health index (P(normal))",
+    )
     ax.axhline(threshold, color="red", linestyle="--", label=f"Threshold = {threshold}")
 
     ax.set_xlabel("Time, s")